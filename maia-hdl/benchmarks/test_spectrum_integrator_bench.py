@@ -0,0 +1,21 @@
+#
+# Copyright (C) 2023 Daniel Estevez <daniel@destevez.net>
+#
+# This file is part of maia-sdr
+#
+# SPDX-License-Identifier: MIT
+#
+
+import pytest
+
+from test import test_spectrum_integrator
+
+
+@pytest.fixture
+def spectrum_integrator_test():
+    return test_spectrum_integrator.TestSpectrumIntegrator()
+
+
+def test_spectrum_integrator_model(benchmark, spectrum_integrator_test):
+    benchmark.pedantic(spectrum_integrator_test.common_model, args=(5,),
+                       rounds=3, warmup_rounds=1)
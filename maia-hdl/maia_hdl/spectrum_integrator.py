@@ -98,13 +98,15 @@ class SpectrumIntegrator(Elaboratable):
             np.array(x, 'int').reshape(-1, nint, 2**self.order_log2)
             for x in [re_in, im_in])
         acc = np.zeros((re_in.shape[0], 2**self.order_log2), 'int')
+        # The Cpwr truncates the accumulator on each addition, so the
+        # integrations cannot be replaced by a single sum over the
+        # integrations axis.
         for j in range(nint):
             acc = self.cpwr.model(re_in[:, j], im_in[:, j], acc)
-        # Bit reverse accumulator order
-        acc = acc[:, [bit_invert(n, self.order_log2, 1)
-                      for n in range(2**self.order_log2)]]
-        # Perform fftshift
-        acc = np.fft.fftshift(acc, axes=-1)
+        # Bit reverse accumulator order and perform fftshift
+        reverse = bit_invert(
+            np.arange(2**self.order_log2), self.order_log2, 1)
+        acc = np.fft.fftshift(acc[:, reverse], axes=-1)
         return acc.ravel()
 
     def elaborate(self, platform):
@@ -6,17 +6,21 @@
 # SPDX-License-Identifier: MIT
 #
 
-import numpy as np
-
-
 def clamp_nbits(x, nbits):
     offset = 2**(nbits - 1)
     return ((x + offset) % 2**nbits) - offset
 
 
 def bit_invert(n, nbits, radix_log2):
-    bits = ('0'*nbits + bin(n)[2:])[-nbits:]
-    bits_arr = np.array([a for a in bits])
-    inverted = bits_arr.reshape(-1, radix_log2)[::-1].ravel()
-    inverted_str = ''.join(list(inverted))
-    return int(inverted_str, 2)
+    # n can be an int or an integer ndarray. The nbits lower bits of n are
+    # split into digits of radix_log2 bits, and the order of the digits is
+    # reversed.
+    ndigits, remainder = divmod(nbits, radix_log2)
+    if remainder:
+        raise ValueError('nbits is not a multiple of radix_log2')
+    mask = 2**radix_log2 - 1
+    inverted = 0
+    for k in range(ndigits):
+        digit = (n >> (k * radix_log2)) & mask
+        inverted = inverted | (digit << ((ndigits - 1 - k) * radix_log2))
+    return inverted
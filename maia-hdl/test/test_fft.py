@@ -324,9 +324,8 @@ class TestFFT(AmaranthSim):
                 out_npy = np.fft.fft(in_complex) / fft_size
                 # Perform bit-order inversion at the output of the numpy FFT.
                 bitinvert_radix = radix_log2 if radix != 'R22' else 1
-                invert = np.array([
-                    bit_invert(n, self.order_log2, bitinvert_radix)
-                    for n in range(fft_size)])
+                invert = bit_invert(
+                    np.arange(fft_size), self.order_log2, bitinvert_radix)
                 out_npy = out_npy[:, invert].ravel()
                 relative_error = np.sqrt(
                     np.sum(np.abs(out_complex - out_npy)**2)
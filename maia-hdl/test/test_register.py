@@ -32,16 +32,30 @@ class TestRegister(AmaranthSim):
             self.register['r_field'].eq(self.readable),
             self.register['rsticky_field'].eq(self.interrupt_enable),
         ]
+        # (offset, width) of each field in rdata and wdata
+        self.field_bits = {}
+        offset = 0
+        for field in self.register.fields:
+            self.field_bits[field.name] = (offset, field.width)
+            offset += field.width
+        self.fields_width = offset
+
+    def decode(self, value, name):
+        """Extract the bits of the field ``name`` from ``value``"""
+        offset, width = self.field_bits[name]
+        return (value >> offset) & ((1 << width) - 1)
 
     def test_initial_value(self):
         def bench():
             yield self.register.ren.eq(1)
             yield
             read = yield self.register.rdata
-            assert read & (2**7 - 1) == 42
-            assert (read >> 7) & (2**5 - 1) == 17
-            assert (read >> (7 + 5)) & (2**12 - 1) == 0
-            assert read >> (7 + 5 + 12) == 0
+            assert self.decode(read, 'rw_field') == 42
+            assert self.decode(read, 'r_field') == 17
+            assert self.decode(read, 'w_field') == 0
+            assert self.decode(read, 'wpulse_field') == 0
+            assert self.decode(read, 'rsticky_field') == 0
+            assert read >> self.fields_width == 0
             yield self.register.ren.eq(0)
             yield
             assert (yield self.register.rdata) == 0
@@ -57,17 +71,20 @@ class TestRegister(AmaranthSim):
             yield self.register.wstrobe.eq(0)
             yield
             rw_field = yield self.register['rw_field']
-            assert rw_field == value & (2**7 - 1)
+            assert rw_field == self.decode(value, 'rw_field')
             r_field = yield self.readable
             assert r_field == 17
             w_field = yield self.register['w_field']
-            assert w_field == (value >> (7 + 5)) & (2**12 - 1)
+            assert w_field == self.decode(value, 'w_field')
             assert (yield self.register.rdata) == 0
             yield self.register.ren.eq(1)
             yield
             yield
             read = yield self.register.rdata
-            assert read == (value & (2**7 - 1)) | (17 << 7)
+            assert self.decode(read, 'rw_field') == self.decode(
+                value, 'rw_field')
+            assert self.decode(read, 'r_field') == 17
+            assert read >> self.field_bits['w_field'][0] == 0
 
         self.simulate(bench)
 
@@ -75,7 +92,7 @@ class TestRegister(AmaranthSim):
         def bench():
             reg = self.register['wpulse_field']
             yield self.register.wstrobe.eq(0xf)
-            value = 1 << (7 + 5 + 12)
+            value = 1 << self.field_bits['wpulse_field'][0]
             yield self.register.wdata.eq(value)
             assert not (yield reg)
             yield
@@ -90,80 +107,45 @@ class TestRegister(AmaranthSim):
         self.simulate(bench)
 
     def test_interrupt(self):
+        intr_bit, _ = self.field_bits['rsticky_field']
+        # Values driven on interrupt_enable and ren at the end of each cycle
+        ie = self.interrupt_enable
+        ren = self.register.ren
+        drive = {
+            4: [(ie, 1)],
+            5: [(ie, 0)],
+            16: [(ren, 1)],
+            17: [(ren, 0)],
+            25: [(ie, 1)],
+            26: [(ie, 0), (ren, 1)],
+            27: [(ren, 0)],
+            30: [(ie, 1), (ren, 1)],
+            31: [(ie, 0), (ren, 0)],
+            34: [(ie, 1), (ren, 1)],
+            35: [(ie, 0), (ren, 0)],
+            36: [(ren, 1)],
+            37: [(ren, 0)],
+        }
+        # Expected values of interrupt and of the interrupt bit of rdata on
+        # each cycle, in groups of 10 cycles
+        expected_interrupt = (
+            '0000000111' '1111111110' '0000000010' '0001111110')
+        expected_rdata_intr = (
+            '0000000000' '0000000100' '0000000100' '0000010100')
+        interrupt = []
+        rdata_intr = []
+
         def bench():
-            for _ in range(4):
-                assert not (yield self.register.interrupt)
-                yield
-            yield self.interrupt_enable.eq(1)
-            assert not (yield self.register.interrupt)
-            yield
-            yield self.interrupt_enable.eq(0)
-            assert not (yield self.register.interrupt)
-            yield
-            assert not (yield self.register.interrupt)
-            for _ in range(10):
+            for cycle in range(len(expected_interrupt)):
+                interrupt.append((yield self.register.interrupt))
+                rdata_intr.append((yield self.register.rdata[intr_bit]))
+                for signal, value in drive.get(cycle, []):
+                    yield signal.eq(value)
                 yield
-                assert (yield self.register.interrupt)
-            yield self.register.ren.eq(1)
-            intr_bit = 7 + 5 + 12 + 1
-            yield
-            assert (yield self.register.interrupt)
-            assert (yield self.register.rdata[intr_bit])
-            yield self.register.ren.eq(0)
-            yield
-            assert (yield self.register.interrupt)
-            yield
-            for _ in range(6):
-                assert not (yield self.register.interrupt)
-                yield
-                assert not (yield self.register.interrupt)
-            yield self.interrupt_enable.eq(1)
-            yield
-            assert not (yield self.register.interrupt)
-            yield self.interrupt_enable.eq(0)
-            yield self.register.ren.eq(1)
-            yield
-            assert not (yield self.register.interrupt)
-            assert (yield self.register.rdata[intr_bit])
-            yield self.register.ren.eq(0)
-            yield
-            assert (yield self.register.interrupt)
-            yield
-            assert not (yield self.register.interrupt)
-            yield
-            assert not (yield self.register.interrupt)
-            yield self.interrupt_enable.eq(1)
-            yield self.register.ren.eq(1)
-            yield
-            assert not (yield self.register.rdata[intr_bit])
-            yield self.interrupt_enable.eq(0)
-            yield self.register.ren.eq(0)
-            yield
-            assert not (yield self.register.interrupt)
-            yield
-            assert (yield self.register.interrupt)
-            yield
-            assert (yield self.register.interrupt)
-            yield self.interrupt_enable.eq(1)
-            yield self.register.ren.eq(1)
-            yield
-            assert (yield self.register.interrupt)
-            yield self.interrupt_enable.eq(0)
-            assert (yield self.register.rdata[intr_bit])
-            yield self.register.ren.eq(0)
-            yield
-            assert (yield self.register.interrupt)
-            yield self.register.ren.eq(1)
-            yield
-            assert (yield self.register.interrupt)
-            assert (yield self.register.rdata[intr_bit])
-            yield self.register.ren.eq(0)
-            yield
-            assert (yield self.register.interrupt)
-            yield
-            assert not (yield self.register.interrupt)
 
         self.simulate(bench, 'interrupt.vcd')
+        self.assertEqual(''.join(map(str, interrupt)), expected_interrupt)
+        self.assertEqual(''.join(map(str, rdata_intr)), expected_rdata_intr)
 
 
 class TestRegisters(AmaranthSim):
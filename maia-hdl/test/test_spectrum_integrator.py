@@ -15,22 +15,73 @@ from maia_hdl.spectrum_integrator import SpectrumIntegrator
 from .amaranth_sim import AmaranthSim
 
 
+# Drives input_last of the SpectrumIntegrator on every nfft-th sample with
+# clken high
+class InputLastTb(Elaboratable):
+    def __init__(self, dut, nfft):
+        self.dut = dut
+        self.nfft = nfft
+
+    def elaborate(self, platform):
+        m = Module()
+        m.submodules.dut = self.dut
+        count = Signal(range(self.nfft))
+        with m.If(self.dut.clken):
+            m.d.sync += count.eq(count + 1)
+        m.d.comb += self.dut.input_last.eq(count == self.nfft - 1)
+        return m
+
+
 class TestSpectrumIntegrator(AmaranthSim):
-    def setUp(self):
-        self.width = 16
-        self.nint_width = 8
-        self.read_delay = 2  # we are using a BRAM output register
+    width = 16
+    nint_width = 8
+    read_delay = 2  # we are using a BRAM output register
+
+    def input_word(self, re, im):
+        # value for Cat(re_in, im_in, clken) with clken set (re and im can be
+        # ints or arrays)
+        mask = 2**self.width - 1
+        return ((re & mask) | ((im & mask) << self.width)
+                | (1 << (2 * self.width)))
+
+    def wait_done(self, skip=0):
+        # done is not polled during the first skip cycles. The callers
+        # compute skip assuming that the inputs take 2 cycles per sample, so
+        # skip must be updated if the stimulus timing changes.
+        for _ in range(skip):
+            yield
+        while True:
+            yield
+            if (yield self.integrator.done):
+                return
+
+    def read_ram(self):
+        # returns an array with the previous integration
+        rdata = np.empty(self.nfft, 'int')
+        yield self.integrator.rden.eq(1)
+        for j in range(self.nfft + self.read_delay):
+            if j < self.nfft:
+                yield self.integrator.rdaddr.eq(j)
+            yield
+            if j >= self.read_delay:
+                rdata[j - self.read_delay] = yield self.integrator.rdata
+        return rdata
+
+    # The model test is split in one test per number of integrations,
+    # rather than using subTest, so that each simulation can be scheduled
+    # independently by a parallel test runner.
+    def test_model_5_integrations(self):
+        self.common_model(5)
+
+    def test_model_2_integrations(self):
+        self.common_model(2)
 
-    def test_model(self):
+    def common_model(self, integrations):
         self.fft_order_log2 = 8
         self.nfft = 2**self.fft_order_log2
-        for integrations in [5, 2]:
-            with self.subTest(integrations=integrations):
-                self.common_model(integrations)
-
-    def common_model(self, integrations):
-        self.dut = SpectrumIntegrator(
+        self.integrator = SpectrumIntegrator(
             self.width, self.nint_width, self.fft_order_log2)
+        self.dut = InputLastTb(self.integrator, self.nfft)
 
         re_in, im_in = (
             np.random.randint(-2**(self.width-1), 2**(self.width-1),
@@ -38,48 +89,34 @@ class TestSpectrumIntegrator(AmaranthSim):
             for _ in range(2))
 
         def set_inputs():
-            yield self.dut.nint.eq(integrations)
-            for j, x in enumerate(zip(re_in, im_in)):
-                re = x[0]
-                im = x[1]
-                yield self.dut.re_in.eq(int(re))
-                yield self.dut.im_in.eq(int(im))
-                yield self.dut.input_last.eq(
-                    j % self.nfft == self.nfft - 1)
-                yield self.dut.clken.eq(1)
+            yield self.integrator.nint.eq(integrations)
+            inputs = Cat(self.integrator.re_in, self.integrator.im_in,
+                         self.integrator.clken)
+            clken_off = self.integrator.clken.eq(0)
+            words = self.input_word(re_in, im_in).tolist()
+            for word in words:
+                yield inputs.eq(word)
                 yield
-                yield self.dut.clken.eq(0)
+                yield clken_off
                 yield
 
         def check_ram_contents():
-            def wait_ready():
-                while True:
-                    yield
-                    if (yield self.dut.done):
-                        return
-
-            def check_ram(expected):
-                read = []
-                yield self.dut.rden.eq(1)
-                for j in range(self.nfft + self.read_delay):
-                    if j < self.nfft:
-                        yield self.dut.rdaddr.eq(j)
-                    yield
-                    if j >= self.read_delay:
-                        k = j - self.read_delay
-                        assert (yield self.dut.rdata) == expected[k]
-
             # The first run doesn't produce good results, so we don't check
             # anything.
-            yield from wait_ready()
+            yield from self.wait_done()
+            # The inputs take 2 cycles per sample. This skips the cycles of
+            # all but one of the FFT vectors of each integration, which is
+            # more than what read_ram() takes.
+            skip = 2 * (integrations - 1) * self.nfft
             for n in range(2):
-                yield from wait_ready()
+                yield from self.wait_done(skip)
                 sel = slice(
                     (n * integrations + 1) * self.nfft,
                     ((n + 1) * integrations + 1) * self.nfft)
-                expected = self.dut.model(
+                expected = self.integrator.model(
                     integrations, re_in[sel], im_in[sel])
-                yield from check_ram(expected)
+                rdata = yield from self.read_ram()
+                np.testing.assert_equal(rdata, expected)
 
         self.simulate([set_inputs, check_ram_contents])
 
@@ -87,49 +124,42 @@ class TestSpectrumIntegrator(AmaranthSim):
         self.fft_order_log2 = 6
         self.nfft = 2**self.fft_order_log2
 
-        self.dut = SpectrumIntegrator(
+        self.integrator = SpectrumIntegrator(
             self.width, self.nint_width, self.fft_order_log2)
+        self.dut = InputLastTb(self.integrator, self.nfft)
         integrations = 5
 
         def set_inputs():
-            yield self.dut.nint.eq(integrations)
-            for n in range(10 * integrations):
-                integration_num = (n - 1) // integrations
-                amplitude = 2**(self.width//2 + (integration_num % 2) + 1)
-                for j in range(self.nfft):
-                    yield self.dut.re_in.eq(0 if j % 2 else amplitude)
-                    yield self.dut.im_in.eq(amplitude if j % 2 else 0)
-                    yield self.dut.input_last.eq(
-                        j % self.nfft == self.nfft - 1)
-                    yield self.dut.clken.eq(1)
-                    yield
-                    yield self.dut.clken.eq(0)
-                    yield
-                    yield
+            yield self.integrator.nint.eq(integrations)
+            inputs = Cat(self.integrator.re_in, self.integrator.im_in,
+                         self.integrator.clken)
+            clken_off = self.integrator.clken.eq(0)
+            n = np.arange(10 * integrations)
+            integration_num = (n - 1) // integrations
+            amplitude = 2**(self.width//2 + (integration_num % 2) + 1)
+            odd = np.arange(self.nfft) % 2 == 1
+            re = np.where(odd, 0, amplitude[:, np.newaxis])
+            im = np.where(odd, amplitude[:, np.newaxis], 0)
+            words = self.input_word(re, im).ravel().tolist()
+            for word in words:
+                yield inputs.eq(word)
+                yield
+                yield clken_off
+                yield
 
         def check_ram_contents():
-            def wait_ready():
-                while True:
-                    yield
-                    if (yield self.dut.done):
-                        return
-
             def check(num_check):
                 amplitude = 8 if num_check % 2 else 2
-                yield self.dut.rden.eq(1)
-                for j in range(self.nfft + self.read_delay):
-                    if j < self.nfft:
-                        yield self.dut.rdaddr.eq(j)
-                    yield
-                    if j >= self.read_delay:
-                        assert \
-                            (yield self.dut.rdata) == integrations * amplitude
+                rdata = yield from self.read_ram()
+                np.testing.assert_equal(rdata, integrations * amplitude)
 
             # The first run doesn't produce good results, so we don't check
             # anything.
-            yield from wait_ready()
+            yield from self.wait_done()
+            # The inputs take 2 cycles per sample.
+            skip = 2 * (integrations - 1) * self.nfft
             for n in range(6):
-                yield from wait_ready()
+                yield from self.wait_done(skip)
                 yield from check(n)
 
         self.simulate([set_inputs, check_ram_contents]),
@@ -9,21 +9,31 @@
 import cocotb
 
 from cocotb.clock import Clock
-from cocotb.triggers import ClockCycles, RisingEdge, FallingEdge
+from cocotb.triggers import ClockCycles, RisingEdge, FallingEdge, with_timeout
 
+# Maximum time that the test waits for the FIFO to stop being full or empty
+FLAG_TIMEOUT_US = 10
 
-async def counter(dut, count, max_iter=1000):
+
+async def counter(dut, count):
     rising = RisingEdge(dut.write_clk)
+    wrerr = dut.wrerr
+    data_in = dut.data_in
+    wren = dut.wren
+    full = dut.full
+    full_falling = FallingEdge(full)
     for n in range(count):
-        for _ in range(max_iter):
+        await rising
+        assert not wrerr.value
+        data_in.value = n
+        while full.value:
+            wren.value = 0
+            # Rather than polling full on every clock cycle, wait until the
+            # FIFO has room again.
+            await with_timeout(full_falling, FLAG_TIMEOUT_US, 'us')
             await rising
-            assert not dut.wrerr.value
-            dut.data_in.value = n
-            dut.wren.value = wren = not dut.full.value
-            if wren:
-                break
-        else:
-            raise Exception('exceded maximum iterations')
+            assert not wrerr.value
+        wren.value = 1
 
 
 @cocotb.test()
@@ -45,8 +55,9 @@ async def test_asyncfifo18_36(dut):
     cocotb.start_soon(counter(dut, count))
 
     falling = FallingEdge(dut.read_clk)
+    empty_falling = FallingEdge(dut.empty)
     for n in range(count):
-        for _ in range(1000):
+        while True:
             await falling
             assert not dut.rderr.value
             has_read = dut.rden.value
@@ -54,3 +65,5 @@ async def test_asyncfifo18_36(dut):
             if has_read:
                 assert dut.data_out.value == n
                 break
+            if not rden:
+                await with_timeout(empty_falling, FLAG_TIMEOUT_US, 'us')
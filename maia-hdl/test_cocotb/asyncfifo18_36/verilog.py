@@ -12,15 +12,19 @@ from amaranth.back.verilog import convert
 
 from maia_hdl.fifo import AsyncFifo18_36
 
+from verilog_cache import write_verilog
 
-def main():
+
+def generate():
     dut = AsyncFifo18_36()
     ports = [dut.reset, dut.data_in, dut.wren, dut.full, dut.wrerr,
              dut.data_out, dut.rden, dut.empty, dut.rderr]
-    with open('dut.v', 'w') as f:
-        f.write('`timescale 1ps/1ps\n')
-        f.write(convert(
-            dut, name='dut', ports=ports, emit_src=False))
+    return '`timescale 1ps/1ps\n' + convert(
+        dut, name='dut', ports=ports, emit_src=False)
+
+
+def main():
+    write_verilog('dut.v', generate)
 
 
 if __name__ == '__main__':
@@ -6,19 +6,26 @@
 
 # Modified AXI4Slave from cocotb_bus
 
-import array
+import collections
 import collections.abc
 import enum
 import itertools
 from typing import Any, List, Optional, Sequence, Tuple, Union
 
 import cocotb
-from cocotb.binary import BinaryValue
 from cocotb.handle import SimHandleBase
 from cocotb.triggers import ClockCycles, Combine, Lock, ReadOnly, RisingEdge
 
 from cocotb_bus.drivers import BusDriver
 
+# Bytes in beat for each value of the 3-bit AxSIZE field. 128 bytes is not
+# supported.
+_SIZE_TO_BYTES_IN_BEAT = (1, 2, 4, 8, 16, 32, 64, None)
+
+_AW = collections.namedtuple(
+    '_AW', ['awaddr', 'awlen', 'awsize', 'awburst', 'awprot',
+            'burst_length', 'bytes_in_beat'])
+
 
 class AXI4Slave(BusDriver):
     '''
@@ -55,6 +62,7 @@ class AXI4Slave(BusDriver):
         self.clock = clock
 
         self.big_endian = big_endian
+        self._byteorder = 'big' if big_endian else 'little'
         self.bus.ARREADY.setimmediatevalue(1)
         self.bus.RVALID.setimmediatevalue(0)
         self.bus.RLAST.setimmediatevalue(0)
@@ -67,88 +75,85 @@ class AXI4Slave(BusDriver):
         self.read_address_busy = Lock("%s_rabusy" % name)
         self.write_data_busy = Lock("%s_wbusy" % name)
 
-        self._aw = []
+        self._aw = collections.deque()
         cocotb.start_soon(self._aw_data())
         cocotb.start_soon(self._read_data())
         cocotb.start_soon(self._write_data())
 
-    def _size_to_bytes_in_beat(self, AxSIZE):
-        if AxSIZE < 7:
-            return 2 ** AxSIZE
-        return None
-
     async def _aw_data(self):
         max_awaddr_queue = 32
         clock_re = RisingEdge(self.clock)
+        awready = self.bus.AWREADY
+        awvalid = self.bus.AWVALID
 
+        # AWREADY is only written when it changes
+        awready_value = 1
         while True:
-            if len(self._aw) < max_awaddr_queue:
-                self.bus.AWREADY.value = 1
-            else:
-                self.bus.AWREADY.value = 0
-            if self.bus.AWREADY.value and self.bus.AWVALID.value:
+            ready = int(len(self._aw) < max_awaddr_queue)
+            if ready != awready_value:
+                awready_value = ready
+                awready.value = awready_value
+            # AWVALID is checked first because it is usually low
+            if awvalid.value and awready.value:
                 _awaddr = int(self.bus.AWADDR)
                 _awlen = int(self.bus.AWLEN)
                 _awsize = int(self.bus.AWSIZE)
                 _awburst = int(self.bus.AWBURST)
                 _awprot = int(self.bus.AWPROT)
                 burst_length = _awlen + 1
-                bytes_in_beat = self._size_to_bytes_in_beat(_awsize)
-
-                self._aw.append({
-                    '_awaddr': _awaddr,
-                    '_awlen': _awlen,
-                    '_awsize': _awsize,
-                    '_awburst': _awburst,
-                    '_awprot': _awprot,
-                    'burst_length': burst_length,
-                    'bytes_in_beat': bytes_in_beat,
-                })
-
-                if __debug__:
-                    self.log.debug(
-                        "AWADDR  %d\n" % _awaddr +
-                        "AWLEN   %d\n" % _awlen +
-                        "AWSIZE  %d\n" % _awsize +
-                        "AWBURST %d\n" % _awburst +
-                        "AWPROT %d\n" % _awprot +
-                        "BURST_LENGTH %d\n" % burst_length +
-                        "Bytes in beat %d\n" % bytes_in_beat)
+                bytes_in_beat = _SIZE_TO_BYTES_IN_BEAT[_awsize]
+
+                self._aw.append(_AW(
+                    _awaddr, _awlen, _awsize, _awburst, _awprot,
+                    burst_length, bytes_in_beat))
+
+                self.log.debug(
+                    "AWADDR  %d\n"
+                    "AWLEN   %d\n"
+                    "AWSIZE  %d\n"
+                    "AWBURST %d\n"
+                    "AWPROT %d\n"
+                    "BURST_LENGTH %d\n"
+                    "Bytes in beat %d\n",
+                    _awaddr, _awlen, _awsize, _awburst, _awprot,
+                    burst_length, bytes_in_beat)
             await clock_re
 
     async def _write_data(self):
         clock_re = RisingEdge(self.clock)
+        wready = self.bus.WREADY
+        wvalid = self.bus.WVALID
+        wdata = self.bus.WDATA
+        memory = self._memory
 
         while True:
             while True:
-                self.bus.WREADY.value = 0
+                wready.value = 0
                 if self._aw:
-                    self.bus.WREADY.value = 1
+                    wready.value = 1
                     break
                 await clock_re
 
             aw = self._aw[0]
-            burst_count = aw['burst_length']
+            burst_count = aw.burst_length
+            address = aw.awaddr
+            bytes_in_beat = aw.bytes_in_beat
 
             await clock_re
 
             while True:
-                if self.bus.WREADY.value and self.bus.WVALID.value:
-                    word = self.bus.WDATA.value
-                    word.big_endian = self.big_endian
-                    _burst_diff = aw['burst_length'] - burst_count
-                    _st = (aw['_awaddr']
-                           + (_burst_diff * aw['bytes_in_beat']))  # start
-                    _end = (aw['_awaddr']
-                            + ((_burst_diff + 1) * aw['bytes_in_beat']))  # end
-                    self._memory[_st:_end] = array.array('B', word.buff)
+                if wready.value and wvalid.value:
+                    word = int(wdata)
+                    memory[address:address + bytes_in_beat] = (
+                        word.to_bytes(bytes_in_beat, self._byteorder))
+                    address += bytes_in_beat
                     burst_count -= 1
                     if burst_count == 0:
                         break
                 await clock_re
 
             if hasattr(self.bus, "BREADY") and hasattr(self.bus, "BVALID"):
-                self.bus.WREADY.value = 0
+                wready.value = 0
                 self.bus.BVALID.value = 1
                 await clock_re
                 while True:
@@ -157,19 +162,25 @@ class AXI4Slave(BusDriver):
                     await clock_re
                 self.bus.BVALID.value = 0
 
-            del self._aw[0]
+            self._aw.popleft()
 
     async def _read_data(self):
         clock_re = RisingEdge(self.clock)
+        read_only = ReadOnly()
+        arvalid = self.bus.ARVALID
+        rready = self.bus.RREADY
+        rdata = self.bus.RDATA
+        rlast = self.bus.RLAST
+        memory = self._memory
 
         while True:
             while True:
-                await ReadOnly()
-                if self.bus.ARVALID.value:
+                await read_only
+                if arvalid.value:
                     break
                 await clock_re
 
-            await ReadOnly()
+            await read_only
             _araddr = int(self.bus.ARADDR)
             _arlen = int(self.bus.ARLEN)
             _arsize = int(self.bus.ARSIZE)
@@ -177,38 +188,36 @@ class AXI4Slave(BusDriver):
             _arprot = int(self.bus.ARPROT)
 
             burst_length = _arlen + 1
-            bytes_in_beat = self._size_to_bytes_in_beat(_arsize)
-
-            word = BinaryValue(n_bits=bytes_in_beat*8,
-                               bigEndian=self.big_endian)
-
-            if __debug__:
-                self.log.debug(
-                    "ARADDR  %d\n" % _araddr +
-                    "ARLEN   %d\n" % _arlen +
-                    "ARSIZE  %d\n" % _arsize +
-                    "ARBURST %d\n" % _arburst +
-                    "ARPROT %d\n" % _arprot +
-                    "BURST_LENGTH %d\n" % burst_length +
-                    "Bytes in beat %d\n" % bytes_in_beat)
+            bytes_in_beat = _SIZE_TO_BYTES_IN_BEAT[_arsize]
+
+            self.log.debug(
+                "ARADDR  %d\n"
+                "ARLEN   %d\n"
+                "ARSIZE  %d\n"
+                "ARBURST %d\n"
+                "ARPROT %d\n"
+                "BURST_LENGTH %d\n"
+                "Bytes in beat %d\n",
+                _araddr, _arlen, _arsize, _arburst, _arprot,
+                burst_length, bytes_in_beat)
 
             burst_count = burst_length
+            address = _araddr
 
             await clock_re
 
+            self.bus.RVALID.value = 1
             while True:
-                self.bus.RVALID.value = 1
-                await ReadOnly()
-                if self.bus.RREADY.value:
-                    _burst_diff = burst_length - burst_count
-                    _st = _araddr + (_burst_diff * bytes_in_beat)
-                    _end = _araddr + ((_burst_diff + 1) * bytes_in_beat)
-                    word.buff = self._memory[_st:_end].tobytes()
-                    self.bus.RDATA.value = word
+                await read_only
+                if rready.value:
+                    rdata.value = int.from_bytes(
+                        memory[address:address + bytes_in_beat],
+                        self._byteorder)
                     if burst_count == 1:
-                        self.bus.RLAST.value = 1
+                        rlast.value = 1
                 await clock_re
                 burst_count -= 1
-                self.bus.RLAST.value = 0
+                address += bytes_in_beat
                 if burst_count == 0:
+                    rlast.value = 0
                     break
@@ -6,18 +6,26 @@
 # SPDX-License-Identifier: MIT
 #
 
-import random
+from rng import rng
 
 
 class RandomReady:
     "Random ready"
-    def __init__(self, max_on=32, max_off=32):
+    def __init__(self, max_on=32, max_off=32, batch_size=1024):
         self.max_on = max_on
         self.max_off = max_off
+        self.batch_size = batch_size
         self.__qualname__ = 'RandomReady'
         self.__doc__ = f'RandomReady({max_on}, {max_off})'
 
+    def __repr__(self):
+        return self.__doc__
+
     def __call__(self):
+        generator = rng()
         while True:
-            yield (random.randint(1, self.max_on),
-                   random.randint(1, self.max_off))
+            on = generator.integers(1, self.max_on, self.batch_size,
+                                    endpoint=True)
+            off = generator.integers(1, self.max_off, self.batch_size,
+                                     endpoint=True)
+            yield from zip(on.tolist(), off.tolist())
@@ -10,7 +10,7 @@ import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import ClockCycles, RisingEdge, FallingEdge
 
-import random
+from rng import rng
 
 
 @cocotb.test()
@@ -33,22 +33,20 @@ async def test_cmult3x(dut):
     num_inputs = 1000
     dut_delay = 3
 
-    re_a, im_a, re_b, im_b = (
-        [random.randrange(-2**15, 2**15) for _ in range(num_inputs)]
-        for _ in range(4))
+    re_a, im_a, re_b, im_b = rng().integers(
+        -2**15, 2**15, size=(4, num_inputs))
+    expected_re = (re_a * re_b - im_a * im_b).tolist()
+    expected_im = (re_a * im_b + im_a * re_b).tolist()
+    inputs = zip(re_a.tolist(), im_a.tolist(), re_b.tolist(), im_b.tolist())
 
-    for j in range(num_inputs):
+    for j, (a, b, c, d) in enumerate(inputs):
         await rising
-        dut.re_a.value = re_a[j]
-        dut.im_a.value = im_a[j]
-        dut.re_b.value = re_b[j]
-        dut.im_b.value = im_b[j]
+        dut.re_a.value = a
+        dut.im_a.value = b
+        dut.re_b.value = c
+        dut.im_b.value = d
         if j >= dut_delay:
-            a = re_a[j - dut_delay]
-            b = im_a[j - dut_delay]
-            c = re_b[j - dut_delay]
-            d = im_b[j - dut_delay]
             re_out = dut.re_out.value.signed_integer
             im_out = dut.im_out.value.signed_integer
-            assert re_out == a * c - b * d
-            assert im_out == a * d + b * c
+            assert re_out == expected_re[j - dut_delay]
+            assert im_out == expected_im[j - dut_delay]
@@ -6,9 +6,9 @@
 # SPDX-License-Identifier: MIT
 #
 
-import array
 import random
-import struct
+
+import numpy as np
 
 import cocotb
 from cocotb_bus.drivers import BitDriver
@@ -16,6 +16,7 @@ from cocotb_bus.drivers import BitDriver
 from axi import AXI4Slave
 from backpressure import RandomReady
 from memory import Memory
+from write_counter import count_writes
 
 from cocotb.clock import Clock
 from cocotb.triggers import ClockCycles, RisingEdge
@@ -24,6 +25,7 @@ from cocotb.regression import TestFactory
 
 BRAM_SIZE = 4096
 NUM_WRITES = 3  # write 3 transfers per test
+TIMEOUT_MS = 1  # 100000 clock cycles
 
 
 class DmaBRAMWriteTB:
@@ -68,24 +70,14 @@ async def run_test(dut, backpressure_inserter=None):
     if backpressure_inserter:
         tb.backpressure.start(backpressure_inserter())
 
-    bytes_written = 0
     bytes_per_word = 8
 
-    starts_task = cocotb.start_soon(starts(dut))
-
-    risign = RisingEdge(dut.clk)
-    for _ in range(100000):
-        if dut.WREADY.value and dut.WVALID.value:
-            bytes_written += bytes_per_word
-        await risign
-        if starts_task.done():
-            break
+    bytes_written = await count_writes(
+        dut, starts(dut), bytes_per_word, TIMEOUT_MS)
 
     assert bytes_written == NUM_WRITES * BRAM_SIZE * 8  # 8 bytes/word
-    expected = array.array('B', [0] * bytes_written)
-    for word in range(bytes_written // bytes_per_word):
-        expected[word*bytes_per_word:(word+1)*bytes_per_word] = (
-            array.array('B', struct.pack('<Q', word % BRAM_SIZE)))
+    words = np.arange(bytes_written // bytes_per_word) % BRAM_SIZE
+    expected = words.astype('<u8').tobytes()
 
     assert tb.memory._data[:bytes_written] == expected,\
         'memory contents do not match'
@@ -6,6 +6,8 @@
 // SPDX-License-Identifier: MIT
 //
 
+`timescale 1ps/1ps
+
 module tb
   (
    output wire [31:0] AWADDR,
@@ -20,7 +22,7 @@ module tb
    output wire        BREADY,
    input wire [1:0]   BRESP,
    input wire         BVALID,
-   input wire         clk,
+   output reg         clk,
    input wire         rst,
    output wire [63:0] WDATA,
    output wire        WLAST,
@@ -42,6 +44,9 @@ module tb
 
    assign ARVALID = 1'b0;
 
+   initial clk = 1'b1;
+   always #5000 clk = ~clk; // 10 ns period
+
    dut dut
      (.awaddr(AWADDR), .awlen(AWLEN), .awsize(AWSIZE), .awburst(AWBURST),
       .awcache(AWCACHE), .awprot(AWPROT), .awvalid(AWVALID), .awready(AWREADY),
@@ -6,10 +6,10 @@
 # SPDX-License-Identifier: MIT
 #
 
-import array
 import random
 import math
-import struct
+
+import numpy as np
 
 import cocotb
 from cocotb_bus.drivers import BitDriver
@@ -17,8 +17,8 @@ from cocotb_bus.drivers import BitDriver
 from axi import AXI4Slave
 from backpressure import RandomReady
 from memory import Memory
+from write_counter import count_writes
 
-from cocotb.clock import Clock
 from cocotb.triggers import ClockCycles, RisingEdge
 from cocotb.regression import TestFactory
 
@@ -26,6 +26,7 @@ NUM_WRITES = 3  # write 3 buffers per test
 MEMORY_START = 0x0000f000
 MEMORY_END = 0x00011000
 MEMORY_BYTES = MEMORY_END - MEMORY_START
+TIMEOUT_MS = 100  # 10 million clock cycles
 
 
 class DmaStreamWriteTB:
@@ -72,7 +73,6 @@ async def stream_data(dut):
 
 
 async def run_test(dut, backpressure_inserter=None):
-    cocotb.start_soon(Clock(dut.clk, 10, units='ns').start())
     cocotb.start_soon(check_address(dut))
     dut.rst.value = 1
     dut.start.value = 0
@@ -84,28 +84,20 @@ async def run_test(dut, backpressure_inserter=None):
     if backpressure_inserter:
         tb.backpressure.start(backpressure_inserter())
 
-    bytes_written = 0
     bytes_per_word = 8
 
     cocotb.start_soon(stream_data(dut))
-    starts_task = cocotb.start_soon(starts(dut))
-
-    risign = RisingEdge(dut.clk)
-    for _ in range(10000000):
-        if dut.WREADY.value and dut.WVALID.value:
-            bytes_written += bytes_per_word
-        await risign
-        if starts_task.done():
-            break
+    bytes_written = await count_writes(
+        dut, starts(dut), bytes_per_word, TIMEOUT_MS)
 
     assert bytes_written == NUM_WRITES * MEMORY_BYTES
-    expected = array.array('B', [0] * MEMORY_BYTES)
-    for j, word in enumerate(
-            range((NUM_WRITES - 1) * MEMORY_BYTES // bytes_per_word,
-                  NUM_WRITES * MEMORY_BYTES // bytes_per_word)):
-        address = (bytes_per_word * j + MEMORY_START) % MEMORY_BYTES
-        expected[address:address+bytes_per_word] = (
-            array.array('B', struct.pack('<Q', word)))
+    # The memory contains the words of the last write, starting at
+    # MEMORY_START modulo the memory size.
+    memory_words = MEMORY_BYTES // bytes_per_word
+    words = np.arange((NUM_WRITES - 1) * memory_words,
+                      NUM_WRITES * memory_words)
+    words = np.roll(words, (MEMORY_START // bytes_per_word) % memory_words)
+    expected = words.astype('<u8').tobytes()
 
     assert tb.memory._data == expected,\
         'memory contents do not match'
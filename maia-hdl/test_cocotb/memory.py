@@ -6,12 +6,10 @@
 # SPDX-License-Identifier: MIT
 #
 
-import array
-
-
 class Memory:
     def __init__(self, size):
-        self._data = array.array('B', [0] * size)
+        self._data = bytearray(size)
+        self._mv = memoryview(self._data)
 
     @property
     def _len(self):
@@ -21,8 +19,13 @@ class Memory:
         if isinstance(key, int):
             return self._data[key % self._len]
         if isinstance(key, slice):
-            return self._data[
-                key.start % self._len:key.stop % self._len]
+            # Addresses wrap around the end of the memory
+            start = key.start % self._len
+            end = start + key.stop - key.start
+            if end <= self._len:
+                return bytes(self._mv[start:end])
+            return (bytes(self._mv[start:])
+                    + bytes(self._mv[:end - self._len]))
         raise ValueError('unsupported key')
 
     def __setitem__(self, key, value):
@@ -30,8 +33,13 @@ class Memory:
             self._data[key % self._len] = value
             return
         if isinstance(key, slice):
-            a = key.start % self._len
-            self._data[
-                a:(key.stop - key.start) + a] = value
+            start = key.start % self._len
+            end = start + key.stop - key.start
+            if end <= self._len:
+                self._mv[start:end] = value
+            else:
+                split = self._len - start
+                self._mv[start:] = value[:split]
+                self._mv[:end - self._len] = value[split:]
             return
         raise ValueError('unsupported key')
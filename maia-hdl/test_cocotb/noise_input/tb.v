@@ -10,14 +10,13 @@
 
 module tb
   (
-   input wire         sampling_clk,
-   input wire         clk,
-   input wire         clk2x_clk,
-   input wire         clk3x_clk,
-   input wire         s_axi_lite_clk,
+   output reg         sampling_clk,
+   output reg         clk,
+   output reg         clk2x_clk,
+   output reg         clk3x_clk,
+   output reg         s_axi_lite_clk,
    input wire         s_axi_lite_rst,
-   input wire [11:0]  re_in,
-   input wire [11:0]  im_in,
+   input wire         stim_en,
    output wire        rst,
    output wire [31:0] AWADDR,
    output wire [2:0]  AWPROT,
@@ -42,6 +41,42 @@ module tb
 
    glbl glbl();
 
+   // The clocks start high, so that the rising edges of clk, clk2x_clk and
+   // clk3x_clk are aligned.
+   initial begin
+      sampling_clk = 1'b1;
+      clk = 1'b1;
+      clk2x_clk = 1'b1;
+      clk3x_clk = 1'b1;
+      s_axi_lite_clk = 1'b1;
+   end
+   always #8000 sampling_clk = ~sampling_clk; // 16 ns period
+   always #6000 clk = ~clk; // 12 ns period
+   always #3000 clk2x_clk = ~clk2x_clk; // 6 ns period
+   always #2000 clk3x_clk = ~clk3x_clk; // 4 ns period
+   always #5000 s_axi_lite_clk = ~s_axi_lite_clk; // 10 ns period
+
+   // Noise stimulus. A 32-bit xorshift generator produces a new pseudorandom
+   // IQ sample on every clk cycle while stim_en is asserted. Generating it
+   // here avoids writing re_in and im_in from Python on every cycle.
+   reg [31:0]         noise_state = 32'h2545f491;
+   wire [31:0]        noise_a = noise_state ^ (noise_state << 13);
+   wire [31:0]        noise_b = noise_a ^ (noise_a >> 17);
+   wire [31:0]        noise_next = noise_b ^ (noise_b << 5);
+   reg [11:0]         re_in = 12'd0;
+   reg [11:0]         im_in = 12'd0;
+
+   always @(posedge clk) begin
+      if (stim_en) begin
+         noise_state <= noise_next;
+         re_in <= noise_next[11:0];
+         im_in <= noise_next[27:16];
+      end else begin
+         re_in <= 12'd0;
+         im_in <= 12'd0;
+      end
+   end
+
    dut dut
      (.sampling_clk(sampling_clk),
       .clk(clk), .clk2x_clk(clk2x_clk), .clk3x_clk(clk3x_clk),
@@ -12,12 +12,16 @@ from amaranth.back.verilog import convert
 
 from maia_hdl.maia_sdr import MaiaSDR
 
+from verilog_cache import write_verilog
 
-def main():
+
+def generate():
     dut = MaiaSDR()
-    with open('dut.v', 'w') as f:
-        f.write(convert(
-            dut, name='dut', ports=dut.ports(), emit_src=False))
+    return convert(dut, name='dut', ports=dut.ports(), emit_src=False)
+
+
+def main():
+    write_verilog('dut.v', generate)
 
 
 if __name__ == '__main__':
@@ -10,9 +10,9 @@
 
 module tb
   (
-   input wire         clk,
+   output reg         clk,
    input wire         rst,
-   input wire         iq_clk,
+   output reg         iq_clk,
    input wire         iq_rst,
    input wire [11:0]  re_in,
    input wire [11:0]  im_in,
@@ -49,6 +49,13 @@ module tb
 
    glbl glbl ();
 
+   initial begin
+      clk = 1'b1;
+      iq_clk = 1'b1;
+   end
+   always #5000 clk = ~clk; // 10 ns period
+   always #6000 iq_clk = ~iq_clk; // 12 ns period
+
    assign ARVALID = 1'b0;
 
    dut dut
@@ -7,11 +7,11 @@
 #
 
 import array
-import random
 import math
 import struct
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 import cocotb
 from cocotb_bus.drivers import BitDriver
@@ -19,10 +19,9 @@ from cocotb_bus.drivers import BitDriver
 from axi import AXI4Slave
 from backpressure import RandomReady
 from memory import Memory
+from rng import rng
 
-from cocotb.clock import Clock
-from cocotb.triggers import ClockCycles, RisingEdge
-from cocotb.regression import TestFactory
+from cocotb.triggers import ClockCycles, ReadOnly, RisingEdge
 
 MEMORY_START = 0x00000000
 MEMORY_END = 0x00001000
@@ -37,18 +36,48 @@ class RecorderTB:
         self.backpressure = BitDriver(dut.WREADY, dut.clk)
 
 
-async def iq_data(dut, sample_stream):
-    n = 0
+# IQ samples sent to the DUT, stored in int16 arrays that grow as needed
+class SampleStream:
+    def __init__(self, capacity=4096):
+        self._re = np.empty(capacity, 'int16')
+        self._im = np.empty(capacity, 'int16')
+        self._size = 0
+
+    def append(self, re, im):
+        if self._size == self._re.size:
+            self._re = np.concatenate([self._re, np.empty_like(self._re)])
+            self._im = np.concatenate([self._im, np.empty_like(self._im)])
+        self._re[self._size] = re
+        self._im[self._size] = im
+        self._size += 1
+
+    def clear(self):
+        self._size = 0
+
+    @property
+    def re(self):
+        return self._re[:self._size]
+
+    @property
+    def im(self):
+        return self._im[:self._size]
+
+
+async def iq_data(dut, sample_stream, batch_size=1024):
     rising = RisingEdge(dut.iq_clk)
+    # The samples are generated in batches
+    generator = rng()
     while True:
-        await rising
-        dut.strobe_in.value = 1
-        dut.re_in.value = re = random.randrange(-2**11, 2**11)
-        dut.im_in.value = im = random.randrange(-2**11, 2**11)
-        sample_stream.append((re, im))
-        await rising
-        dut.strobe_in.value = 0
-        await rising
+        samples = generator.integers(-2**11, 2**11, size=(batch_size, 2))
+        for re, im in samples.tolist():
+            await rising
+            dut.strobe_in.value = 1
+            dut.re_in.value = re
+            dut.im_in.value = im
+            sample_stream.append(re, im)
+            await rising
+            dut.strobe_in.value = 0
+            await rising
 
 
 async def start(dut):
@@ -68,61 +97,64 @@ async def stop(dut):
 
 
 async def wait_finished(dut):
-    rising = RisingEdge(dut.clk)
-    while True:
-        await rising
-        if dut.finished.value:
-            return
+    # finished is pulsed for one cycle, so it is low when this is called.
+    # Waiting for its edge avoids polling it on every clock cycle. ReadOnly
+    # lets the other outputs settle before they are checked.
+    await RisingEdge(dut.finished)
+    await ReadOnly()
 
 
 def check_output(tb, sample_stream):
-    written = tb.memory._data[:tb.dut.next_address.value]
-    sample_re = np.array([a[0] for a in sample_stream])
-    sample_im = np.array([a[1] for a in sample_stream])
+    # This is a view of the recorder memory, not a copy
+    written = np.frombuffer(
+        tb.memory._mv[:int(tb.dut.next_address.value)], 'uint8')
+    sample_re = sample_stream.re
+    sample_im = sample_stream.im
     if tb.dut.mode_8bit.value:
-        re = np.array(written[::2], 'int8').astype('int16') << 4
-        im = np.array(written[1::2], 'int8').astype('int16') << 4
+        re = written[::2].view('int8').astype('int16') << 4
+        im = written[1::2].view('int8').astype('int16') << 4
         sample_re = sample_re >> 4 << 4
         sample_im = sample_im >> 4 << 4
     else:
-        L = len(written) // 3 * 3
-        re = ((np.array(written[:L:3], 'int8').astype('int16') << 4)
-              | (np.array(written[1:L:3], 'uint8').astype('int16') >> 4))
-        im = (((np.array(written[1:L:3], 'uint8') << 4).view('int8')
-               .astype('int16') << 4)
-              | np.array(written[2:L:3], 'uint8'))
-    for j in range(sample_re.size - re.size):
-        if sample_re[j] == re[0]:
-            re_match = np.array_equal(sample_re[j:][:re.size], re)
-            im_match = np.array_equal(sample_im[j:][:re.size], im)
-            if re_match and im_match:
-                break
-    else:
+        L = written.size // 3 * 3
+        b = written[:L].reshape(-1, 3).astype('int16')
+        # Each sample is placed in the upper 12 bits of an int16 and then
+        # sign-extended by an arithmetic shift.
+        re = ((b[:, 0] << 8) | (b[:, 1] & 0xf0)) >> 4
+        im = ((b[:, 1] << 12) | (b[:, 2] << 4)) >> 4
+    if re.size > sample_re.size:
+        raise Exception('unable to find match in sample_stream')
+    # Compare the windows of sample_stream whose first sample matches
+    # against the output, all at once.
+    windows_re = sliding_window_view(sample_re, re.size)
+    windows_im = sliding_window_view(sample_im, re.size)
+    candidates = np.flatnonzero(windows_re[:, 0] == re[0])
+    match = (np.all(windows_re[candidates] == re, axis=1)
+             & np.all(windows_im[candidates] == im, axis=1))
+    if not np.any(match):
         raise Exception('unable to find match in sample_stream')
 
 
-async def run_test(dut, backpressure_inserter=None):
-    sample_stream = []
-    cocotb.start_soon(Clock(dut.clk, 10, units='ns').start())
-    cocotb.start_soon(Clock(dut.iq_clk, 12, units='ns').start())
+async def run_test(dut, tb, backpressure_inserter=None):
+    dut._log.info('running with backpressure_inserter = %r',
+                  backpressure_inserter)
+    sample_stream = SampleStream()
+    # Clear the data written by the previous run
+    tb.memory[0:MEMORY_BYTES] = bytes(MEMORY_BYTES)
     dut.rst.value = 1
     dut.iq_rst.value = 1
-    dut.start.value = 0
-    dut.stop.value = 0
     dut.mode_8bit.value = 0
-    dut.strobe_in.value = 0
     await ClockCycles(dut.clk, 10)
-    tb = RecorderTB(dut)
     dut.rst.value = 0
     dut.iq_rst.value = 0
 
     if backpressure_inserter:
         tb.backpressure.start(backpressure_inserter())
 
-    cocotb.start_soon(iq_data(dut, sample_stream))
+    iq_task = cocotb.start_soon(iq_data(dut, sample_stream))
 
     await ClockCycles(dut.clk, 10)
-    del sample_stream[:]
+    sample_stream.clear()
     await start(dut)
     await wait_finished(dut)
     assert dut.next_address.value == MEMORY_END
@@ -133,7 +165,7 @@ async def run_test(dut, backpressure_inserter=None):
     await ClockCycles(dut.clk, 100)
     dut.mode_8bit.value = 1
     await ClockCycles(dut.clk, 20)
-    del sample_stream[:]
+    sample_stream.clear()
     await start(dut)
     await ClockCycles(dut.clk, 1000)
     await stop(dut)
@@ -143,8 +175,20 @@ async def run_test(dut, backpressure_inserter=None):
     assert dut.dropped_samples.value == 0
     check_output(tb, sample_stream)
 
+    iq_task.kill()
+    dut.strobe_in.value = 0
+    if backpressure_inserter:
+        tb.backpressure.stop()
 
-factory = TestFactory(run_test)
-factory.add_option('backpressure_inserter',
-                   [None, RandomReady(), RandomReady(2, 2)])
-factory.generate_tests()
+
+@cocotb.test()
+async def test_recorder(dut):
+    dut.rst.setimmediatevalue(1)
+    dut.iq_rst.setimmediatevalue(1)
+    for signal in [dut.start, dut.stop, dut.mode_8bit, dut.strobe_in]:
+        signal.setimmediatevalue(0)
+    tb = RecorderTB(dut)
+    # The backpressure variants run one after the other, with a reset in
+    # between, so that the simulator is only started once.
+    for backpressure_inserter in [None, RandomReady(), RandomReady(2, 2)]:
+        await run_test(dut, tb, backpressure_inserter)
@@ -12,14 +12,18 @@ from amaranth.back.verilog import convert
 
 from maia_hdl.recorder import Recorder12IQ
 
+from verilog_cache import write_verilog
 
-def main():
+
+def generate():
     m = Recorder12IQ(0x00000000, 0x00001000,
                      domain_in='iq', domain_dma='sync')
-    with open('dut.v', 'w') as f:
-        f.write('`timescale 1ps/1ps\n')
-        f.write(convert(
-            m, name='dut', ports=m.ports(), emit_src=False))
+    return '`timescale 1ps/1ps\n' + convert(
+        m, name='dut', ports=m.ports(), emit_src=False)
+
+
+def main():
+    write_verilog('dut.v', generate)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,17 @@
+#
+# Copyright (C) 2023 Daniel Estevez <daniel@destevez.net>
+#
+# This file is part of maia-sdr
+#
+# SPDX-License-Identifier: MIT
+#
+
+import random
+
+import numpy as np
+
+
+def rng():
+    # Seeded from random, which cocotb seeds with RANDOM_SEED, so that the
+    # tests can be reproduced
+    return np.random.default_rng(random.getrandbits(64))
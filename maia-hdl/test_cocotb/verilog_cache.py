@@ -0,0 +1,45 @@
+#
+# Copyright (C) 2023 Daniel Estevez <daniel@destevez.net>
+#
+# This file is part of maia-sdr
+#
+# SPDX-License-Identifier: MIT
+#
+
+import hashlib
+import pathlib
+import sys
+
+import amaranth
+
+import maia_hdl
+
+
+def _sources_hash():
+    h = hashlib.sha256()
+    h.update(amaranth.__version__.encode())
+    sources = sorted(pathlib.Path(maia_hdl.__file__).parent.glob('*.py'))
+    script = getattr(sys.modules['__main__'], '__file__', None)
+    if script is not None:
+        sources.append(pathlib.Path(script))
+    for source in sources:
+        h.update(source.name.encode())
+        h.update(source.read_bytes())
+    return h.hexdigest()
+
+
+def write_verilog(path, generate):
+    """Write the Verilog from generate() to path, unless it is up to date.
+
+    A hash of the maia_hdl sources, the running verilog.py script and the
+    amaranth version is stored next to path, and generate() is only called
+    if it has changed.
+    """
+    path = pathlib.Path(path)
+    hash_path = path.with_name(path.name + '.hash')
+    sources_hash = _sources_hash()
+    if (path.exists() and hash_path.exists()
+            and hash_path.read_text() == sources_hash):
+        return
+    path.write_text(generate())
+    hash_path.write_text(sources_hash)
@@ -0,0 +1,29 @@
+#
+# Copyright (C) 2023 Daniel Estevez <daniel@destevez.net>
+#
+# This file is part of maia-sdr
+#
+# SPDX-License-Identifier: MIT
+#
+
+import cocotb
+from cocotb.triggers import RisingEdge, with_timeout
+
+
+async def count_writes(dut, coro, bytes_per_word, timeout_ms):
+    # Returns the number of bytes accepted on the AXI W channel while coro
+    # runs, failing if it takes longer than timeout_ms.
+    bytes_written = 0
+
+    async def counter():
+        nonlocal bytes_written
+        rising = RisingEdge(dut.clk)
+        while True:
+            if dut.WREADY.value and dut.WVALID.value:
+                bytes_written += bytes_per_word
+            await rising
+
+    counter_task = cocotb.start_soon(counter())
+    await with_timeout(cocotb.start_soon(coro), timeout_ms, 'ms')
+    counter_task.kill()
+    return bytes_written
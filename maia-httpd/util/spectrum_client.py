@@ -2,22 +2,44 @@
 
 import argparse
 import asyncio
+import collections
 import threading
 
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
 import websockets
 
 
-async def spectrum_loop(address, line):
+async def spectrum_loop(address, spectra):
     async with websockets.connect(address) as ws:
         while True:
-            spec = np.frombuffer(await ws.recv(), 'float32')
-            line.set_ydata(10*np.log10(spec))
+            spectra.append(np.frombuffer(await ws.recv(), 'float32'))
 
 
-def main_async(args, line):
-    asyncio.run(spectrum_loop(args.ws_address, line))
+def main_async(args, spectra):
+    asyncio.run(spectrum_loop(args.ws_address, spectra))
+
+
+def plot_updater(line, spectra):
+    spec_db = None
+
+    def update(frame):
+        nonlocal spec_db
+        try:
+            spec = spectra.pop()
+        except IndexError:
+            return line,
+        # Convert to dB in place in a buffer that is reused for all the
+        # spectra of the same size
+        if spec_db is None or spec_db.size != spec.size:
+            spec_db = np.empty_like(spec)
+        np.log10(spec, out=spec_db)
+        spec_db *= 10
+        line.set_ydata(spec_db)
+        return line,
+
+    return update
 
 
 def prepare_plot():
@@ -41,8 +63,15 @@ def parse_args():
 def main():
     args = parse_args()
     fig, ax, line = prepare_plot()
-    loop = threading.Thread(target=main_async, args=(args, line))
+    # The websocket thread only keeps the latest spectrum. The plot is
+    # updated from the GUI thread, dropping the spectra that arrive faster
+    # than the plot refresh rate.
+    spectra = collections.deque(maxlen=1)
+    loop = threading.Thread(target=main_async, args=(args, spectra))
     loop.start()
+    # The animation must be kept referenced while the plot is shown
+    animation = FuncAnimation(fig, plot_updater(line, spectra), interval=33,
+                              cache_frame_data=False)
     plt.show(block=True)
 
 